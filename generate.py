@@ -6,38 +6,261 @@ This script scans for HTML files (excluding index.html itself) and creates
 an index page listing all available snippets.
 """
 
+import argparse
+import html
+import json
+import mmap
 import os
 import re
+import shutil
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
+# Patterns operate on the raw bytes of the memory-mapped file; only matched
+# groups are decoded. Each pattern finds several fields in one pass, reporting which
+# one matched through match.lastgroup.
+#
+# Elements are matched by their tag name only; the end of the opening tag and
+# the closing tag are found with separate forward searches. A pattern such as
+# `<p[^>]*>(.*?)</p>` would be retried from every `<p` when the tag or the
+# element is never closed, which is quadratic in the file size.
+_HEAD_RE = re.compile(
+    rb'<(?P<title>title)>|<(?P<meta>meta)\b|(?P<head_end></head\s*>)',
+    re.IGNORECASE
+)
+_BODY_RE = re.compile(rb'<(?P<h1>h1)\b|<(?P<p>p)\b', re.IGNORECASE)
+_CLOSING_TAG_RE = {
+    'title': re.compile(rb'</title>', re.IGNORECASE),
+    'h1': re.compile(rb'</h1>', re.IGNORECASE),
+    'p': re.compile(rb'</p>', re.IGNORECASE),
+}
+# Applied to the text of a single <meta> tag
+_META_NAME_RE = re.compile(rb'name=["\']description["\']', re.IGNORECASE)
+_META_CONTENT_RE = re.compile(rb'content=["\']([^"\']*)["\']', re.IGNORECASE)
+_TAG_STRIP_RE = re.compile(r'<[^>]+>')
 
-def extract_title_from_html(filepath):
+# Extracted metadata is cached here, in the scanned directory, between runs.
+# Bump the version whenever extraction changes so stale entries are dropped.
+_CACHE_FILE = '.index_cache.json'
+_CACHE_VERSION = 3
+
+# Below this many files to extract, starting a thread pool costs more than
+# overlapping their reads saves
+_PARALLEL_THRESHOLD = 32
+
+
+def _text_content(fragment):
     """
-    Extract the title from an HTML file.
+    Return the plain text of a UTF-8 encoded HTML fragment.
+    
+    Tags are stripped, character references are decoded and whitespace is
+    collapsed, so a fragment like ``<b>Tom &amp;\n Jerry</b>`` becomes
+    ``Tom & Jerry``.
+    
+    Raises UnicodeDecodeError if the fragment is not valid UTF-8, so that
+    mis-encoded snippets are reported rather than shown with replacement
+    characters.
+    """
+    text = fragment.decode('utf-8')
+    if '<' in text:
+        # Strip HTML tags. A '<' after the last '>' cannot start a tag, and
+        # retrying the pattern from each one would be quadratic
+        tags_end = text.rfind('>') + 1
+        text = _TAG_STRIP_RE.sub('', text[:tags_end]) + text[tags_end:]
+    text = html.unescape(text)
+    return ' '.join(text.split())  # Normalize whitespace
+
+
+def _meta_description(tag):
+    """
+    Return the content attribute of a description <meta> tag.
+    
+    Args:
+        tag: The bytes of a single <meta> tag
+        
+    Returns:
+        The content attribute's bytes, or None if the tag is not a
+        description or has no content
+    """
+    name = _META_NAME_RE.search(tag)
+    if name is None:
+        return None
+    content = _META_CONTENT_RE.search(tag, name.end())
+    return content.group(1) if content else None
+
+
+def _match_fragment(content, match, unclosed):
+    """
+    Return the raw bytes of the field matched by _HEAD_RE or _BODY_RE.
+    
+    For <meta> this is the description, and for other elements the text up
+    to the closing tag.
+    
+    Args:
+        content: The mapped file contents
+        match: Match object for the field
+        unclosed: Dict mapping element names, or '>' for tags in general,
+            to the offset from which they are known to be unclosed or
+            unterminated; updated when a new one is found
+        
+    Returns:
+        Tuple of (fragment, resume). fragment is the field's bytes, or None
+        if the tag is not a description <meta> or is never terminated or
+        closed. resume is the offset to continue scanning from: the end of
+        the opening tag, so its contents are never scanned again.
+    """
+    field = match.lastgroup
+    start = match.start()
+    # Matches before the recorded offsets are unaffected; in particular the
+    # body pass rescans from the top when there is no </head>
+    if start >= min(unclosed.get(field, len(content)), unclosed.get('>', len(content))):
+        return None, match.end()
+    if field == 'title':
+        tag_end = match.end()
+    else:
+        # Only the tag name was matched, so find where the tag ends
+        tag_end = content.find(b'>', match.end()) + 1
+        if not tag_end:
+            # No later tag is terminated either
+            unclosed['>'] = start
+            return None, match.end()
+        if field == 'meta':
+            return _meta_description(content[match.end():tag_end]), tag_end
+    closing = _CLOSING_TAG_RE[field].search(content, tag_end)
+    if closing is None:
+        # Any later element of this kind is unclosed too
+        unclosed[field] = start
+        return None, tag_end
+    return content[tag_end:closing.start()], tag_end
+
+
+def _find_fields(content):
+    """
+    Find the title and description candidates in an HTML document.
+    
+    Args:
+        content: The mapped file contents
+        
+    Returns:
+        Dict mapping each field found ('title', 'meta', 'h1', 'p') to its
+        raw bytes
+    """
+    found = {}
+    unclosed = {}
+    
+    # <title> and <meta> live in <head>, so look for both in a single pass
+    # that stops at </head>, or as soon as both are found. Documents without
+    # a closing </head> are scanned in full.
+    body_start = 0
+    pos = 0
+    while len(found) < 2:
+        match = _HEAD_RE.search(content, pos)
+        if match is None:
+            break
+        if match.lastgroup == 'head_end':
+            body_start = match.end()
+            break
+        if match.lastgroup in found:
+            pos = match.end()
+            continue
+        fragment, pos = _match_fragment(content, match, unclosed)
+        if fragment is not None:
+            found[match.lastgroup] = fragment
+    
+    # Fall back to the first <h1> and <p> in a single pass over the body
+    pos = body_start
+    while not (found.keys() & {'title', 'h1'} and found.keys() & {'meta', 'p'}):
+        match = _BODY_RE.search(content, pos)
+        if match is None:
+            break
+        if match.lastgroup in found:
+            pos = match.end()
+            continue
+        fragment, pos = _match_fragment(content, match, unclosed)
+        if fragment is not None:
+            found[match.lastgroup] = fragment
+    
+    return found
+
+
+def _extract_metadata(filepath):
+    """
+    Extract the title and description from an HTML file.
+    
+    Like extract_metadata, but also reports whether the file could be read,
+    so that fallback values for unreadable files are not cached.
     
     Args:
         filepath: Path to the HTML file
         
     Returns:
-        The title string, or the filename if no title is found
+        Tuple of (title, description, ok), where ok is False if reading or
+        decoding the file failed
     """
+    title = None
+    description = ""
+    ok = True
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            content = f.read()
-            # Look for <title> tag
-            title_match = re.search(r'<title>(.*?)</title>', content, re.IGNORECASE | re.DOTALL)
-            if title_match:
-                return title_match.group(1).strip()
-            # Look for <h1> tag as fallback
-            h1_match = re.search(r'<h1[^>]*>(.*?)</h1>', content, re.IGNORECASE | re.DOTALL)
-            if h1_match:
-                return h1_match.group(1).strip()
+        found = {}
+        with open(filepath, 'rb') as f:
+            # mmap() rejects empty files, which have nothing to find anyway
+            if os.fstat(f.fileno()).st_size:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as content:
+                    found = _find_fields(content)
+        
+        title_fragment = found.get('title', found.get('h1'))
+        if title_fragment is not None:
+            title = _text_content(title_fragment)
+        if 'meta' in found:
+            description = _text_content(found['meta'])
+        elif 'p' in found:
+            desc = _text_content(found['p'])
+            if len(desc) > 150:
+                desc = desc[:150] + '...'
+            description = desc
     except Exception as e:
         print(f"Warning: Could not read {filepath}: {e}")
+        ok = False
+    
+    if title is None:
+        # Use filename without extension as fallback
+        title = Path(filepath).stem.replace('_', ' ').title()
+    
+    return title, description, ok
+
+
+def extract_metadata(filepath):
+    """
+    Extract the title and description from an HTML file.
+    
+    The file is memory-mapped rather than read, so only the pages the scan
+    reaches are loaded, and the scan stops in <head> as soon as it has
+    yielded both a title and a description.
+    
+    Args:
+        filepath: Path to the HTML file
+        
+    Returns:
+        Tuple of (title, description). The title falls back to the filename
+        and the description to an empty string if none is found.
+    """
+    title, description, _ = _extract_metadata(filepath)
+    return title, description
+
+
+def extract_title_from_html(filepath):
+    """
+    Extract the title from an HTML file.
     
-    # Return filename without extension as fallback
-    return Path(filepath).stem.replace('_', ' ').title()
+    Args:
+        filepath: Path to the HTML file
+        
+    Returns:
+        The title string, or the filename if no title is found
+    """
+    return extract_metadata(filepath)[0]
 
 
 def extract_description_from_html(filepath):
@@ -50,63 +273,124 @@ def extract_description_from_html(filepath):
     Returns:
         A description string, or empty string if none found
     """
+    return extract_metadata(filepath)[1]
+
+
+def _load_cache(path):
+    """
+    Load the metadata cache.
+    
+    Args:
+        path: Path to the cache file
+        
+    Returns:
+        Dict mapping filename to [mtime_ns, size, title, description], or an
+        empty dict if the cache is missing, unreadable or out of date.
+        Malformed entries are dropped, so those files are extracted again.
+    """
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            content = f.read()
-            # Look for meta description
-            meta_match = re.search(
-                r'<meta[^>]*name=["\']description["\'][^>]*content=["\']([^"\']*)["\'][^>]*>',
-                content,
-                re.IGNORECASE
-            )
-            if meta_match:
-                return meta_match.group(1).strip()
-            # Look for first paragraph as fallback
-            p_match = re.search(r'<p[^>]*>(.*?)</p>', content, re.IGNORECASE | re.DOTALL)
-            if p_match:
-                desc = re.sub(r'<[^>]+>', '', p_match.group(1))  # Strip HTML tags
-                desc = ' '.join(desc.split())  # Normalize whitespace
-                if len(desc) > 150:
-                    desc = desc[:150] + '...'
-                return desc
-    except Exception as e:
-        print(f"Warning: Could not read {filepath}: {e}")
+        with open(path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(cache, dict) or cache.get('version') != _CACHE_VERSION:
+        return {}
+    entries = cache.get('entries')
+    if not isinstance(entries, dict):
+        return {}
+    return {name: value for name, value in entries.items()
+            if _is_valid_cache_entry(value)}
+
+
+def _is_valid_cache_entry(value):
+    """Check that a cache entry is a [mtime_ns, size, title, description] list."""
+    return (
+        isinstance(value, list) and len(value) == 4
+        and all(type(item) is int for item in value[:2])
+        and all(isinstance(item, str) for item in value[2:])
+    )
+
+
+def _save_cache(path, entries):
+    """
+    Save the metadata cache.
     
-    return ""
+    Args:
+        path: Path to the cache file
+        entries: Dict mapping filename to [mtime_ns, size, title, description]
+    """
+    try:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'version': _CACHE_VERSION, 'entries': entries}, f)
+    except OSError as e:
+        print(f"Warning: Could not write {path}: {e}")
 
 
 def find_html_snippets(directory='.'):
     """
     Find all HTML files in the directory (excluding index.html).
     
+    Metadata is only extracted for files whose modification time or size
+    changed since the last run; the rest comes from the cache file.
+    
     Args:
         directory: Directory to search in (default: current directory)
         
     Returns:
         List of tuples: (filename, title, description)
     """
-    snippets = []
+    # DirEntry.is_file() uses the file type reported by the directory
+    # listing, avoiding a stat() call per entry
+    with os.scandir(directory) as it:
+        entries = sorted(
+            (entry for entry in it
+             if entry.name.endswith('.html') and entry.name != 'index.html'
+             and entry.is_file()),
+            key=lambda entry: entry.name
+        )
+    
+    cache_path = os.path.join(directory, _CACHE_FILE)
+    cache = _load_cache(cache_path)
+    metadata = {}
+    failed = set()
+    changed = []
+    for entry in entries:
+        stat = entry.stat()
+        key = [stat.st_mtime_ns, stat.st_size]
+        cached = cache.get(entry.name)
+        if cached and cached[:2] == key:
+            metadata[entry.name] = cached
+        else:
+            changed.append((entry, key))
+    
+    paths = [entry.path for entry, _ in changed]
+    if len(changed) < _PARALLEL_THRESHOLD:
+        results = map(_extract_metadata, paths)
+    else:
+        # File reads release the GIL, so threads overlap the I/O of large
+        # batches, e.g. on a first run or a cold cache
+        with ThreadPoolExecutor(max_workers=32) as executor:
+            results = list(executor.map(_extract_metadata, paths))
+    for (entry, key), (title, description, ok) in zip(changed, results):
+        metadata[entry.name] = key + [title, description]
+        if not ok:
+            failed.add(entry.name)
+    
+    # Files that could not be read are left out, so they are retried (and
+    # warned about) on the next run even if their mtime and size don't change
+    entries_to_cache = {name: value for name, value in metadata.items()
+                        if name not in failed}
     
-    for filename in sorted(os.listdir(directory)):
-        if filename.endswith('.html') and filename != 'index.html':
-            filepath = os.path.join(directory, filename)
-            if os.path.isfile(filepath):
-                title = extract_title_from_html(filepath)
-                description = extract_description_from_html(filepath)
-                snippets.append((filename, title, description))
+    # Only rewrite the cache when something was added, changed or removed
+    if entries_to_cache != cache:
+        _save_cache(cache_path, entries_to_cache)
     
-    return snippets
+    return [(entry.name, *metadata[entry.name][2:]) for entry in entries]
 
 
-def generate_index_html(snippets, output_file='index.html'):
-    """
-    Generate the index.html file from the list of snippets.
-    
-    Args:
-        snippets: List of tuples (filename, title, description)
-        output_file: Output filename (default: index.html)
-    """
-    html_template = """<!DOCTYPE html>
+# Placeholders are plain %%NAME%% markers rather than str.format fields, so
+# the CSS braces can be written as-is.
+_HTML_TEMPLATE = """<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
@@ -114,101 +398,101 @@ def generate_index_html(snippets, output_file='index.html'):
     <meta name="description" content="A collection of code snippets and small one-page apps">
     <title>Code Snippets Collection</title>
     <style>
-        * {{
+        * {
             margin: 0;
             padding: 0;
             box-sizing: border-box;
-        }}
+        }
         
-        body {{
+        body {
             font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen, Ubuntu, Cantarell, sans-serif;
             line-height: 1.6;
             color: #333;
             background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
             min-height: 100vh;
             padding: 20px;
-        }}
+        }
         
-        .container {{
+        .container {
             max-width: 900px;
             margin: 0 auto;
             background: white;
             border-radius: 12px;
             box-shadow: 0 10px 40px rgba(0, 0, 0, 0.2);
             overflow: hidden;
-        }}
+        }
         
-        header {{
+        header {
             background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
             color: white;
             padding: 40px 30px;
             text-align: center;
-        }}
+        }
         
-        header h1 {{
+        header h1 {
             font-size: 2.5em;
             margin-bottom: 10px;
             font-weight: 700;
-        }}
+        }
         
-        header p {{
+        header p {
             font-size: 1.1em;
             opacity: 0.95;
-        }}
+        }
         
-        .content {{
+        .content {
             padding: 40px 30px;
-        }}
+        }
         
-        .snippet-count {{
+        .snippet-count {
             color: #666;
             font-size: 0.95em;
             margin-bottom: 30px;
             text-align: center;
-        }}
+        }
         
-        .snippets-list {{
+        .snippets-list {
             list-style: none;
-        }}
+        }
         
-        .snippet-item {{
+        .snippet-item {
             background: #f8f9fa;
             border-radius: 8px;
             margin-bottom: 20px;
             padding: 25px;
             transition: all 0.3s ease;
             border-left: 4px solid #667eea;
-        }}
+        }
         
-        .snippet-item:hover {{
+        .snippet-item:hover {
             transform: translateY(-2px);
             box-shadow: 0 4px 12px rgba(0, 0, 0, 0.1);
             background: #f1f3f5;
-        }}
+        }
         
-        .snippet-item h2 {{
+        .snippet-item h2 {
             font-size: 1.5em;
             margin-bottom: 10px;
             color: #2d3748;
-        }}
+        }
         
-        .snippet-item h2 a {{
+        .snippet-item h2 a {
             color: #667eea;
             text-decoration: none;
             transition: color 0.3s ease;
-        }}
+        }
         
-        .snippet-item h2 a:hover {{
+        .snippet-item h2 a:hover {
             color: #764ba2;
-        }}
+        }
         
-        .snippet-description {{
+        .snippet-description {
             color: #666;
             margin-bottom: 12px;
             line-height: 1.5;
-        }}
+        }
         
-        .snippet-filename {{
+        .snippet-filename {
             font-family: 'Courier New', monospace;
             font-size: 0.85em;
             color: #999;
@@ -216,51 +500,51 @@ def generate_index_html(snippets, output_file='index.html'):
             padding: 4px 8px;
             border-radius: 4px;
             display: inline-block;
-        }}
+        }
         
-        .empty-state {{
+        .empty-state {
             text-align: center;
             padding: 60px 20px;
             color: #666;
-        }}
+        }
         
-        .empty-state h2 {{
+        .empty-state h2 {
             font-size: 1.5em;
             margin-bottom: 10px;
             color: #999;
-        }}
+        }
         
-        footer {{
+        footer {
             background: #f8f9fa;
             padding: 20px 30px;
             text-align: center;
             color: #666;
             font-size: 0.9em;
             border-top: 1px solid #e9ecef;
-        }}
+        }
         
-        footer a {{
+        footer a {
             color: #667eea;
             text-decoration: none;
-        }}
+        }
         
-        footer a:hover {{
+        footer a:hover {
             text-decoration: underline;
-        }}
+        }
         
-        @media (max-width: 768px) {{
-            header h1 {{
+        @media (max-width: 768px) {
+            header h1 {
                 font-size: 2em;
-            }}
+            }
             
-            .content {{
+            .content {
                 padding: 30px 20px;
-            }}
+            }
             
-            .snippet-item {{
+            .snippet-item {
                 padding: 20px;
-            }}
-        }}
+            }
+        }
     </style>
 </head>
 <body>
@@ -272,60 +556,157 @@ def generate_index_html(snippets, output_file='index.html'):
         
         <div class="content">
             <div class="snippet-count">
-                {snippet_count}
+                %%SNIPPET_COUNT%%
             </div>
             
-            {snippets_content}
+            %%SNIPPETS_CONTENT%%
         </div>
         
         <footer>
-            <p>Generated on {timestamp} | <a href="https://github.com/willf/snippets" target="_blank">View on GitHub</a></p>
+            <p>Generated on %%TIMESTAMP%% | <a href="https://github.com/willf/snippets" target="_blank">View on GitHub</a></p>
         </footer>
     </div>
 </body>
 </html>
 """
+
+# Split once at import so the page can be streamed around the snippet count
+# and list; only the footer timestamp is substituted per run.
+_HTML_PREFIX, _, _HTML_REST = _HTML_TEMPLATE.partition('%%SNIPPET_COUNT%%')
+_HTML_MIDDLE, _, _HTML_SUFFIX = _HTML_REST.partition('%%SNIPPETS_CONTENT%%')
+
+
+_SNIPPET_LIST_START = """<ul class="snippets-list">
+"""
+
+_SNIPPET_LIST_END = """            </ul>"""
+
+_SNIPPET_ITEM = """                <li class="snippet-item">
+                    <h2><a href="{href}">{title}</a></h2>
+{description}                    <span class="snippet-filename">{filename}</span>
+                </li>
+"""
+
+_SNIPPET_DESCRIPTION = """                    <p class="snippet-description">{description}</p>
+"""
+
+_EMPTY_STATE = """            <div class="empty-state">
+                <h2>No Snippets Yet</h2>
+                <p>Add HTML files to this directory and run generate.py again.</p>
+            </div>"""
+
+
+def _render_snippet(filename, title, description):
+    """Return the list item markup for a single snippet, HTML-escaped."""
+    if description:
+        description = _SNIPPET_DESCRIPTION.format(description=html.escape(description))
+    return _SNIPPET_ITEM.format(
+        # Percent-encode the link so names with '#', '%' or '?' still resolve
+        href=html.escape(urllib.parse.quote(filename)),
+        filename=html.escape(filename),
+        title=html.escape(title),
+        description=description
+    )
+
+
+def generate_index_html(snippets, output_file='index.html'):
+    """
+    Generate the index.html file from the list of snippets.
     
-    # Generate snippets HTML
+    Args:
+        snippets: List of tuples (filename, title, description)
+        output_file: Output filename (default: index.html)
+    """
     if snippets:
         snippet_count = f"Found {len(snippets)} snippet{'s' if len(snippets) != 1 else ''}"
-        snippets_html = '<ul class="snippets-list">\n'
-        
-        for filename, title, description in snippets:
-            snippets_html += f'                <li class="snippet-item">\n'
-            snippets_html += f'                    <h2><a href="{filename}">{title}</a></h2>\n'
-            if description:
-                snippets_html += f'                    <p class="snippet-description">{description}</p>\n'
-            snippets_html += f'                    <span class="snippet-filename">{filename}</span>\n'
-            snippets_html += f'                </li>\n'
-        
-        snippets_html += '            </ul>'
     else:
         snippet_count = "No snippets found"
-        snippets_html = '''            <div class="empty-state">
-                <h2>No Snippets Yet</h2>
-                <p>Add HTML files to this directory and run generate.py again.</p>
-            </div>'''
     
     # Generate timestamp
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     
-    # Fill in the template
-    html_content = html_template.format(
-        snippet_count=snippet_count,
-        snippets_content=snippets_html,
-        timestamp=timestamp
-    )
+    # Stream the page to a temporary file piece by piece rather than
+    # assembling it in memory first; the large buffer keeps this to a few
+    # write calls. The file only replaces output_file once it is complete,
+    # so a failure part way through never leaves a truncated index behind
+    # that index_is_up_to_date() would then consider current.
+    tmp_file = output_file + '.tmp'
+    try:
+        with open(tmp_file, 'w', encoding='utf-8', buffering=1 << 20) as f:
+            f.write(_HTML_PREFIX)
+            f.write(snippet_count)
+            f.write(_HTML_MIDDLE)
+            if snippets:
+                f.write(_SNIPPET_LIST_START)
+                for filename, title, description in snippets:
+                    f.write(_render_snippet(filename, title, description))
+                f.write(_SNIPPET_LIST_END)
+            else:
+                f.write(_EMPTY_STATE)
+            f.write(_HTML_SUFFIX.replace('%%TIMESTAMP%%', timestamp))
+        if os.path.exists(output_file):
+            shutil.copymode(output_file, tmp_file)
+        os.replace(tmp_file, output_file)
+    except BaseException:
+        try:
+            os.remove(tmp_file)
+        except OSError:
+            pass
+        raise
     
-    # Write to file
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(html_content)
+    # The rename updates the directory's mtime; touch the index so it stays
+    # at least as new, otherwise index_is_up_to_date() would never succeed
+    os.utime(output_file)
     
     print(f"✓ Generated {output_file} with {len(snippets)} snippet(s)")
 
 
-def main():
+def index_is_up_to_date(directory='.', output_file='index.html'):
+    """
+    Check whether the index is newer than everything it is generated from.
+    
+    Args:
+        directory: Directory containing the snippets (default: current directory)
+        output_file: Index filename (default: index.html)
+        
+    Returns:
+        True if the index exists and no snippet, the directory listing or
+        this script changed after it was written
+    """
+    try:
+        index_mtime = os.stat(os.path.join(directory, output_file)).st_mtime_ns
+    except OSError:
+        return False
+    
+    # The directory's mtime changes when snippets are added, removed or
+    # renamed, and this script's when the page template changes
+    source_mtimes = [os.stat(directory).st_mtime_ns, os.stat(__file__).st_mtime_ns]
+    with os.scandir(directory) as it:
+        source_mtimes.extend(
+            entry.stat().st_mtime_ns for entry in it
+            if entry.name.endswith('.html') and entry.name != output_file
+            and entry.is_file()
+        )
+    
+    return index_mtime >= max(source_mtimes)
+
+
+def main(argv=None):
     """Main function to generate the index."""
+    parser = argparse.ArgumentParser(
+        description="Generate index.html from HTML snippets in the current directory."
+    )
+    parser.add_argument(
+        '--force',
+        action='store_true',
+        help="regenerate index.html even if it is newer than all snippets"
+    )
+    args = parser.parse_args(argv)
+    
+    if not args.force and index_is_up_to_date():
+        print("index.html is up to date")
+        return
+    
     print("Scanning for HTML snippets...")
     snippets = find_html_snippets()
     